@@ -1,5 +1,12 @@
 import re
 import os
+import math
+import functools
+import marshal
+import mmap
+import struct
+import sys
+import tempfile
 
 """
 Editor de Codigo Simples com Lexer e Parser
@@ -12,9 +19,11 @@ Estrutura Principal:
 ------------------
 1. TOKENS: Definicao dos tokens da linguagem
 2. Lexer: Analise lexica do codigo
-3. Parser: Analise sintatica e execucao do codigo
-4. Funcoes Utilitarias: Manipulacao de arquivos e tratamento de erros
-5. Interface do Usuario: Sistema de entrada/saida interativo
+3. BUILTINS: Registro de funcoes nativas (register_builtin)
+4. Parser: Analise sintatica e execucao do codigo
+5. Snapshots: Gravacao e carga do estado global em arquivo binario
+6. Funcoes Utilitarias: Manipulacao de arquivos e tratamento de erros
+7. Interface do Usuario: Sistema de entrada/saida interativo
 
 Funcionalidades Suportadas:
 -------------------------
@@ -24,14 +33,18 @@ Funcionalidades Suportadas:
 - Condicionais (if/else)
 - Operacoes matematicas e logicas
 - Manipulacao de listas
+- Funcoes nativas (builtins) implementadas em Python
 - Sistema de undo/redo
 - Salvamento e carregamento de arquivos
+- Snapshots do estado global (variaveis e funcoes) para retomar execucoes
 
 Comandos do Editor:
 -----------------
 - 'compilar': Executa o codigo atual
 - 'salvar <arquivo>': Salva o codigo em um arquivo
 - 'abrir <arquivo>': Carrega codigo de um arquivo
+- 'snapshot <arquivo>': Executa o codigo atual e grava o estado global
+- 'retomar <arquivo>': Usa um snapshot como estado inicial das compilacoes
 - 'desfazer': Desfaz ultima acao
 - 'refazer': Refaz ultima acao desfeita
 - 'sair': Encerra o programa
@@ -96,6 +109,81 @@ def lexer(code):
             raise SyntaxError(f"Token desconhecido: {code[:10]}") # Gera um erro de token desconhecido
     return tokens # Retorna a lista de tokens
 
+# Registro de funcoes nativas (implementadas em Python)
+BUILTINS = {}
+
+def register_builtin(name, function, arity=None, pure=False, cache_size=0, registry=None):
+    """
+    Registra uma funcao Python como funcao nativa da linguagem.
+
+    Funcoes nativas sao resolvidas separadamente das funcoes definidas com
+    'function' e chamadas diretamente, sem criar um novo Parser.
+
+    Args:
+        name (str): Nome usado para chamar a funcao no codigo
+        function (callable): Funcao Python a ser executada
+        arity (int): Numero de argumentos esperado (None aceita qualquer numero)
+        pure (bool): Indica que a funcao nao tem efeitos colaterais
+        cache_size (int): Quantidade de resultados guardados para funcoes puras
+            e custosas (0 desativa o cache). O mesmo objeto e devolvido a todas
+            as chamadas com os mesmos argumentos, entao so use cache em funcoes
+            que retornam valores imutaveis (numeros, strings, tuplas)
+        registry (dict): Registro de destino (padrao: BUILTINS)
+
+    Returns:
+        callable: A propria funcao registrada
+
+    Raises:
+        ValueError: Quando o nome nao e um identificador valido ou e uma palavra reservada
+    """
+    if not re.fullmatch(TOKENS['IDENTIFIER'], name): # Verifica se o nome e um identificador
+        raise ValueError(f"Nome invalido para funcao nativa: {name}") # Gera um erro se nao for
+    for token_type, pattern in TOKENS.items(): # Verifica se o lexer reconhece o nome como outro token
+        if token_type != 'IDENTIFIER' and re.fullmatch(pattern, name): # Palavras reservadas nunca chegam como IDENTIFIER
+            raise ValueError(f"Nome reservado nao pode ser funcao nativa: {name}") # Gera um erro se for reservada
+    if registry is None: # Usa o registro global por padrao
+        registry = BUILTINS
+    cached = None # Versao da funcao com cache limitado
+    if pure and cache_size > 0: # Apenas funcoes puras podem reaproveitar resultados
+        cached = functools.lru_cache(maxsize=cache_size, typed=True)(function) # typed diferencia 1, 1.0 e True
+    registry[name] = { # Adiciona a funcao ao registro
+        'function': function, # Funcao Python
+        'arity': arity, # Numero de argumentos
+        'pure': pure, # Indica se a funcao e pura
+        'cached': cached, # Funcao com cache (None se desativado)
+    }
+    return function # Retorna a funcao registrada
+
+def _builtin_read_file(filename): # Le o conteudo de um arquivo
+    with open(filename, 'r') as file:
+        return file.read()
+
+def _builtin_write_file(filename, content): # Escreve o conteudo em um arquivo
+    replace_file(filename, [str(content)], 'w') # Nao trunca um snapshot que ainda esteja mapeado
+    return len(str(content))
+
+# Biblioteca padrao de funcoes nativas
+register_builtin('len', len, 1, pure=True) # Tamanho de lista ou string
+register_builtin('abs', abs, 1, pure=True) # Valor absoluto
+register_builtin('min', lambda values: min(values), 1, pure=True) # Menor elemento de uma lista
+register_builtin('max', lambda values: max(values), 1, pure=True) # Maior elemento de uma lista
+register_builtin('sum', lambda values: sum(values), 1, pure=True) # Soma dos elementos de uma lista
+register_builtin('sqrt', math.sqrt, 1, pure=True) # Raiz quadrada
+register_builtin('pow', pow, 2, pure=True, cache_size=128) # Potencia (custosa para expoentes grandes)
+register_builtin('mod', lambda a, b: a % b, 2, pure=True) # Resto da divisao
+register_builtin('sort', lambda values: sorted(values), 1, pure=True) # Lista ordenada
+register_builtin('reverse', lambda values: values[::-1], 1, pure=True) # Lista ou string invertida
+register_builtin('range', lambda *args: list(range(*args)), None, pure=True) # Lista de inteiros
+register_builtin('split', lambda text, sep: text.split(sep), 2, pure=True) # Divide uma string
+register_builtin('join', lambda values, sep: sep.join(str(v) for v in values), 2, pure=True) # Junta uma lista em string
+register_builtin('upper', lambda text: text.upper(), 1, pure=True) # String em maiusculas
+register_builtin('lower', lambda text: text.lower(), 1, pure=True) # String em minusculas
+register_builtin('str', str, 1, pure=True) # Converte para string
+register_builtin('int', int, 1, pure=True) # Converte para inteiro
+register_builtin('get', lambda values, index: values[index], 2, pure=True) # Elemento de uma lista pelo indice
+register_builtin('read_file', _builtin_read_file, 1) # Le um arquivo
+register_builtin('write_file', _builtin_write_file, 2) # Escreve um arquivo
+
 class Parser:
     """
     Realiza a analise sintatica e execucao do codigo.
@@ -105,20 +193,23 @@ class Parser:
         position (int): Posicao atual na lista de tokens
         variables (dict): Dicionario de variaveis
         functions (dict): Dicionario de funcoes
+        builtins (dict): Registro de funcoes nativas
         return_value: Valor de retorno de funcoes
         in_function (bool): Indica se esta dentro de uma funcao
     """
-    def __init__(self, tokens):
+    def __init__(self, tokens, builtins=None):
         """
         Inicializa o parser com uma lista de tokens.
         
         Args:
             tokens (list): Lista de tokens para analise
+            builtins (dict): Registro de funcoes nativas (padrao: BUILTINS)
         """
         self.tokens = tokens # Lista de tokens
         self.position = 0 # Posicao atual
         self.variables = {} # Dicionario de variaveis
         self.functions = {} # Dicionario de funcoes
+        self.builtins = BUILTINS if builtins is None else builtins # Registro de funcoes nativas
         self.return_value = None # Valor de retorno
         self.in_function = False # Indica se esta dentro de uma funcao
 
@@ -208,7 +299,7 @@ class Parser:
             self.position += 1
         
         # Avalia a condicao
-        condition_parser = Parser(condition_tokens)
+        condition_parser = Parser(condition_tokens, self.builtins)
         condition_parser.variables = self.variables.copy()
         condition_parser.functions = self.functions
         condition_result = condition_parser.evaluate_condition()
@@ -234,13 +325,13 @@ class Parser:
         
         # Executa o bloco apropriado
         if condition_result:
-            block_parser = Parser(if_block_tokens)
+            block_parser = Parser(if_block_tokens, self.builtins)
             block_parser.variables = self.variables.copy()
             block_parser.functions = self.functions
             block_parser.parse()
             self.variables.update(block_parser.variables)
         elif else_block_tokens:
-            block_parser = Parser(else_block_tokens)
+            block_parser = Parser(else_block_tokens, self.builtins)
             block_parser.variables = self.variables.copy()
             block_parser.functions = self.functions
             block_parser.parse()
@@ -274,7 +365,7 @@ class Parser:
         
         while True: # Loop do laco 'while'
             # Avalia a condicao usando um sub-parser
-            condition_parser = Parser(condition_tokens) # Cria um novo parser para a condicao
+            condition_parser = Parser(condition_tokens, self.builtins) # Cria um novo parser para a condicao
             condition_parser.variables = self.variables.copy() # Copia as variaveis do escopo atual
             condition_parser.functions = self.functions # Copia as funcoes
             condition_result = condition_parser.evaluate_condition() # Avalia a condicao
@@ -283,7 +374,7 @@ class Parser:
                 break # Interrompe o loop
             
             # Executa o corpo do loop usando um sub-parser
-            loop_parser = Parser(loop_body_tokens) # Cria um novo parser para o corpo do loop
+            loop_parser = Parser(loop_body_tokens, self.builtins) # Cria um novo parser para o corpo do loop
             loop_parser.variables = self.variables.copy() # Copia as variaveis do escopo atual
             loop_parser.functions = self.functions # Copia as funcoes
             loop_parser.parse() # Chama a funcao de analise sintatica
@@ -344,6 +435,9 @@ class Parser:
         else: # Se nao houver argumentos
             raise SyntaxError("Esperado '(' apos o nome da funcao") # Gera um erro se nao houver parenteses de abertura
     
+        if func_name not in self.functions and func_name in self.builtins: # Funcoes do usuario tem prioridade sobre as nativas
+            return self.call_builtin(func_name, args) # Chama a funcao nativa diretamente
+
         if func_name not in self.functions: # Verifica se a funcao foi definida
             raise NameError(f"Funcao nao definida: {func_name}") # Gera um erro se a funcao nao foi definida
     
@@ -351,7 +445,7 @@ class Parser:
         if len(args) != len(function['parameters']): # Verifica se o numero de argumentos e igual ao numero de parametros
             raise SyntaxError("Numero incorreto de argumentos na chamada da funcao") # Gera um erro se o numero de argumentos for diferente do numero de parametros
     
-        func_parser = Parser(function['body']) # Cria um novo parser para a funcao
+        func_parser = Parser(function['body'], self.builtins) # Cria um novo parser para a funcao
         func_parser.variables = self.variables.copy() # Copia as variaveis do escopo atual
         func_parser.functions = self.functions # Copia as funcoes
         func_parser.in_function = True # Indica que esta dentro de uma funcao
@@ -365,6 +459,42 @@ class Parser:
 
         return return_value # Retorna o valor de retorno
 
+    def call_builtin(self, func_name, args): # Chamada de funcao nativa
+        """
+        Executa uma funcao nativa sem criar um novo parser.
+
+        Funcoes registradas com cache reaproveitam o resultado de chamadas
+        anteriores; argumentos que nao podem ser usados como chave (listas)
+        executam a funcao sem cache.
+
+        Args:
+            func_name (str): Nome da funcao nativa
+            args (list): Argumentos ja avaliados
+
+        Returns:
+            Valor retornado pela funcao Python
+
+        Raises:
+            SyntaxError: Quando o numero de argumentos nao corresponde a aridade
+                ou quando a funcao Python gera um erro
+        """
+        builtin = self.builtins[func_name] # Pega a funcao do registro
+        if builtin['arity'] is not None and len(args) != builtin['arity']: # Verifica a aridade declarada
+            raise SyntaxError("Numero incorreto de argumentos na chamada da funcao") # Gera um erro se for diferente
+
+        try:
+            if builtin['cached'] is None: # Funcao sem cache
+                return builtin['function'](*args)
+
+            try:
+                return builtin['cached'](*args) # Reaproveita o resultado anterior, se houver
+            except TypeError: # Argumentos nao hashable (ex.: listas) ou erro da propria funcao
+                return builtin['function'](*args) # Executa sem cache (um erro real se repete aqui)
+        except (SyntaxError, NameError): # Erros que o interpretador ja trata
+            raise
+        except Exception as e: # Erros do codigo Python (ValueError, IndexError, ZeroDivisionError...)
+            raise SyntaxError(f"Erro na funcao nativa {func_name}: {e}") from e # Converte para um erro tratado pelo editor
+
     def parse_assignment(self): # Atribuicao de variavel
         var_name = self.tokens[self.position][1]  # Pega o nome da variavel
         self.position += 1  # Pula o identificador
@@ -401,7 +531,10 @@ class Parser:
             else: # Se nao for uma chamada de funcao
                 self.position += 1 # Avanca para o proximo token
                 if value in self.variables: # Verifica se a variavel foi definida
-                    return self.variables[value] # Retorna o valor da variavel
+                    variable = self.variables[value] # Pega o valor da variavel
+                    if type(variable) is LazyValue: # Valor carregado de um snapshot sob demanda
+                        variable = self.variables[value] = variable.get() # Desserializa e substitui o valor no escopo
+                    return variable # Retorna o valor da variavel
                 else: # Se a variavel nao foi definida
                     raise NameError(f"Variavel nao definida: {value}") # Gera um erro
         elif token_type == 'OPEN_PAREN': # Verifica se o token e '('
@@ -507,7 +640,7 @@ class Parser:
         # Executa o corpo do loop para cada elemento da sequencia
         for item in sequence: # Itera sobre a sequencia
             # Cria um novo parser para cada iteracao
-            loop_parser = Parser(loop_body_tokens) # Cria um novo parser para o corpo do loop
+            loop_parser = Parser(loop_body_tokens, self.builtins) # Cria um novo parser para o corpo do loop
             loop_parser.variables = self.variables.copy() # Copia as variaveis do escopo atual
             loop_parser.functions = self.functions # Copia as funcoes
             
@@ -520,6 +653,167 @@ class Parser:
             # Atualiza as variaveis do escopo externo
             self.variables.update(loop_parser.variables) # Atualiza as variaveis do escopo externo
 
+# Snapshots do estado global
+SNAPSHOT_MAGIC = b'CDLSNAP2' # Identificador e versao do formato
+SNAPSHOT_PREFIX = struct.Struct('<BBI') # Versao do Python (marshal muda entre versoes) e tamanho do cabecalho
+LAZY_LIST_THRESHOLD = 1024 # Listas com pelo menos esse tamanho sao carregadas sob demanda
+
+class LazyValue:
+    """
+    Valor de um snapshot desserializado apenas na primeira leitura.
+
+    Attributes:
+        name (str): Nome da variavel, usado nas mensagens de erro
+        buffer (mmap.mmap): Arquivo do snapshot mapeado em memoria
+        offset (int): Inicio do valor serializado no buffer
+        size (int): Tamanho do valor serializado
+    """
+    __slots__ = ('name', 'buffer', 'offset', 'size', 'value', 'loaded')
+
+    def __init__(self, name, buffer, offset, size):
+        self.name = name # Nome da variavel
+        self.buffer = buffer # Arquivo mapeado em memoria
+        self.offset = offset # Posicao do valor
+        self.size = size # Tamanho em bytes
+        self.value = None # Valor desserializado
+        self.loaded = False # Indica se o valor ja foi desserializado
+
+    def get(self): # Retorna o valor, desserializando se necessario
+        if not self.loaded: # Primeira leitura
+            try:
+                value = marshal.loads(self.buffer[self.offset:self.offset + self.size]) # Desserializa o valor
+            except (ValueError, EOFError, TypeError) as e: # Bloco corrompido ou mapeamento fechado
+                raise SyntaxError(f"Snapshot invalido: lista '{self.name}' corrompida") from e
+            if not isinstance(value, list): # Apenas listas grandes sao gravadas em blocos separados
+                raise SyntaxError(f"Snapshot invalido: lista '{self.name}' corrompida")
+            self.value = value # Guarda o valor desserializado
+            self.loaded = True
+            self.buffer = None # O mapeamento nao e mais necessario para este valor
+        return self.value
+
+def save_snapshot(filename, parser):
+    """
+    Grava as variaveis e funcoes globais de um parser em um arquivo binario.
+
+    As funcoes sao gravadas ja tokenizadas, e listas grandes sao gravadas
+    em blocos separados para serem carregadas sob demanda.
+
+    Args:
+        filename (str): Nome do arquivo de saida
+        parser (Parser): Parser cujo estado sera gravado
+
+    Raises:
+        ValueError: Quando uma variavel possui um valor que nao pode ser gravado
+    """
+    variables = {} # Variaveis gravadas no cabecalho
+    lazy = {} # Posicao e tamanho das listas grandes
+    blocks = [] # Listas grandes serializadas
+    offset = 0 # Posicao atual na area de dados
+    for name, value in parser.variables.items(): # Itera sobre as variaveis
+        if type(value) is LazyValue: # Valor ainda nao lido de outro snapshot
+            value = value.get()
+        if isinstance(value, list) and len(value) >= LAZY_LIST_THRESHOLD: # Lista grande
+            data = marshal.dumps(value) # Serializa a lista
+            lazy[name] = (offset, len(data)) # Guarda a posicao da lista
+            blocks.append(data) # Adiciona a lista a area de dados
+            offset += len(data) # Avanca a posicao
+        else: # Valor pequeno
+            variables[name] = value # Grava no cabecalho
+
+    functions = { # Funcoes em forma compilada (tokens)
+        name: {'parameters': list(function['parameters']), 'body': [tuple(token) for token in function['body']]}
+        for name, function in parser.functions.items()
+    }
+    header = marshal.dumps({'variables': variables, 'lazy': lazy, 'functions': functions}) # Serializa o cabecalho
+
+    prefix = SNAPSHOT_PREFIX.pack(sys.version_info[0], sys.version_info[1], len(header)) # Versao e tamanho do cabecalho
+    replace_file(filename, [SNAPSHOT_MAGIC, prefix, header] + blocks, 'wb') # Grava sem truncar um snapshot mapeado
+
+def load_snapshot(filename, parser=None):
+    """
+    Carrega um snapshot gravado por save_snapshot.
+
+    Listas grandes nao sao lidas imediatamente: o arquivo e mapeado em
+    memoria e cada lista e desserializada na primeira vez que e usada.
+
+    Args:
+        filename (str): Nome do arquivo do snapshot
+        parser (Parser): Parser que recebera o estado (padrao: novo Parser vazio)
+
+    Returns:
+        Parser: Parser com as variaveis e funcoes do snapshot
+
+    Raises:
+        FileNotFoundError: Se o arquivo nao existir
+        ValueError: Se o arquivo nao for um snapshot valido ou tiver sido
+            gravado por outra versao do Python
+    """
+    if parser is None: # Cria um parser vazio se nenhum for informado
+        parser = Parser([])
+    start = len(SNAPSHOT_MAGIC) + SNAPSHOT_PREFIX.size # Fim do identificador, da versao e do tamanho do cabecalho
+    with open(filename, 'rb') as file: # Abre o arquivo para leitura binaria
+        if os.fstat(file.fileno()).st_size < start: # Arquivo menor que o inicio obrigatorio
+            raise ValueError(f"Snapshot invalido: {filename}") # Gera um erro se estiver truncado
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) # Mapeia o arquivo em memoria
+
+    if buffer[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC: # Verifica o identificador
+        buffer.close() # Libera o mapeamento
+        raise ValueError(f"Snapshot invalido: {filename}") # Gera um erro se nao for um snapshot
+    major, minor, header_size = SNAPSHOT_PREFIX.unpack_from(buffer, len(SNAPSHOT_MAGIC)) # Le a versao e o tamanho do cabecalho
+    if (major, minor) != sys.version_info[:2]: # O formato do marshal depende da versao do Python
+        buffer.close() # Libera o mapeamento
+        raise ValueError(f"Snapshot gravado pelo Python {major}.{minor}, incompativel com {sys.version_info[0]}.{sys.version_info[1]}: {filename}")
+
+    try:
+        data_start = start + header_size # Inicio da area de dados
+        if data_start > len(buffer): # Cabecalho truncado
+            raise ValueError("cabecalho truncado")
+        header = marshal.loads(buffer[start:data_start]) # Desserializa o cabecalho
+
+        variables = dict(header['variables']) # Variaveis pequenas
+        lazy = {} # Listas grandes carregadas sob demanda
+        for name, (offset, size) in header['lazy'].items(): # Valida a posicao de cada lista
+            if offset < 0 or size < 0 or data_start + offset + size > len(buffer): # Bloco fora do arquivo
+                raise ValueError("bloco de dados truncado")
+            lazy[name] = LazyValue(name, buffer, data_start + offset, size)
+        functions = { # Funcoes em forma compilada (tokens)
+            name: {'parameters': list(function['parameters']), 'body': [tuple(token) for token in function['body']]}
+            for name, function in header['functions'].items()
+        }
+    except (ValueError, EOFError, TypeError, KeyError, AttributeError) as e: # Arquivo corrompido
+        buffer.close() # Libera o mapeamento
+        raise ValueError(f"Snapshot invalido: {filename}") from e # Converte para o erro tratado pelo editor
+
+    if not lazy: # Nenhuma lista grande: o mapeamento nao e mais necessario
+        buffer.close()
+    parser.variables.update(variables) # Carrega as variaveis pequenas
+    parser.variables.update(lazy) # Carrega as listas grandes sob demanda
+    parser.functions.update(functions) # Carrega as funcoes
+    return parser # Retorna o parser com o estado carregado
+
+def close_snapshot(parser, load=True):
+    """
+    Fecha os arquivos mapeados em memoria pelas variaveis de um snapshot.
+
+    Deve ser chamada antes de sobrescrever o arquivo do snapshot (no Windows
+    um arquivo mapeado nao pode ser reescrito) ou ao descartar o estado.
+
+    Args:
+        parser (Parser): Parser carregado por load_snapshot
+        load (bool): Desserializa as listas ainda nao lidas antes de fechar;
+            se False, essas variaveis deixam de poder ser usadas
+    """
+    buffers = {} # Mapeamentos a fechar
+    for name, value in parser.variables.items(): # Itera sobre as variaveis
+        if type(value) is not LazyValue: # Valor ja em memoria
+            continue
+        if value.buffer is not None: # Valor ainda nao lido
+            buffers[id(value.buffer)] = value.buffer
+        if load: # Le o valor antes de fechar o mapeamento
+            parser.variables[name] = value.get()
+    for buffer in buffers.values(): # Fecha cada mapeamento uma unica vez
+        buffer.close()
+
 def suggest_correction(error_message, code_lines):
     """
     Sugere correcoes para erros comuns no codigo.
@@ -545,6 +839,8 @@ def suggest_correction(error_message, code_lines):
         "Numero incorreto de argumentos na chamada da funcao": "Verifique o numero de argumentos ao chamar a funcao.",
         "Entrada invalida: esperado um numero inteiro.": "Certifique-se de inserir um numero inteiro valido.",
         "Lista nao fechada: esperado ']'": "Certifique-se de fechar a lista com ']'.",
+        "Erro na funcao nativa": "Verifique os argumentos passados para a funcao nativa.",
+        "Snapshot invalido": "Grave o snapshot novamente com 'snapshot <nome_do_arquivo>'.",
     }
     for error, suggestion_text in suggestion.items(): # Itera sobre as sugestoes
         if error in error_message: # Verifica se o erro esta na mensagem
@@ -577,6 +873,40 @@ def save_file(filename, code_lines): # Salva o codigo em um arquivo
     with open(filename, 'w') as file: # Abre o arquivo para escrita
         file.write("\n".join(code_lines)) # Escreve o codigo no arquivo
 
+def replace_file(filename, chunks, mode): # Substitui um arquivo de uma so vez
+    """
+    Grava um arquivo temporario no mesmo diretorio e o move sobre o destino.
+
+    O arquivo original nunca e truncado: snapshots mapeados em memoria
+    continuam lendo o conteudo antigo, e uma falha na escrita nao deixa
+    o destino pela metade.
+
+    Args:
+        filename (str): Nome do arquivo de destino
+        chunks (list): Partes do conteudo, na ordem em que serao escritas
+        mode (str): Modo de escrita ('w' para texto, 'wb' para binario)
+    """
+    try: # Mantem as permissoes do arquivo substituido
+        permissions = os.stat(filename).st_mode & 0o777
+    except FileNotFoundError: # Arquivo novo: permissoes padrao do sistema
+        umask = os.umask(0) # Le a mascara atual
+        os.umask(umask) # Restaura a mascara
+        permissions = 0o666 & ~umask
+
+    directory = os.path.dirname(os.path.abspath(filename)) # Diretorio do destino
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix='.tmp-') # Cria o arquivo temporario
+    try:
+        with os.fdopen(fd, mode) as file: # Abre o arquivo temporario
+            file.writelines(chunks) # Escreve o conteudo
+        os.chmod(temp_name, permissions) # mkstemp cria o arquivo com 0600
+        os.replace(temp_name, filename) # Move o temporario sobre o destino
+    except BaseException: # Falha: remove o temporario e repassa o erro
+        try:
+            os.remove(temp_name)
+        except OSError:
+            pass
+        raise
+
 def open_file(filename): # Abre e le um arquivo
     """
     Abre e le um arquivo de codigo.
@@ -598,6 +928,7 @@ def clear_console(): # Limpa o console
     print("Digite seu codigo. Para compilar e ver o resultado, digite 'compilar'. Para encerrar, digite 'sair'.\n") # Exibe mensagem de inicio
     print("Para salvar o codigo, digite 'salvar <nome_do_arquivo>'. Para abrir um arquivo, digite 'abrir <nome_do_arquivo>'.\n") # Exibe mensagem de salvar/abrir arquivo
     print("Para desfazer a ultima acao, digite 'desfazer'. Para refazer a ultima acao desfeita, digite 'refazer'.\n") # Exibe mensagem de desfazer/refazer
+    print("Para gravar o estado apos executar o codigo, digite 'snapshot <nome_do_arquivo>'. Para retomar a partir dele, digite 'retomar <nome_do_arquivo>'.\n") # Exibe mensagem de snapshot
     print("Para limpar o console, digite 'clear'. Para excluir o codigo feito, digite 'excluir'.\n") # Exibe mensagem de limpar/excluir codigo
 
 def execute_user_code(): # Funcao principal
@@ -613,10 +944,13 @@ def execute_user_code(): # Funcao principal
     print("Digite seu codigo. Para compilar e ver o resultado, digite 'compilar'. Para encerrar, digite 'sair'.\n") # Exibe mensagem de inicio
     print("Para salvar o codigo, digite 'salvar <nome_do_arquivo>'. Para abrir um arquivo, digite 'abrir <nome_do_arquivo>'.\n") # Exibe mensagem de salvar/abrir arquivo
     print("Para desfazer a ultima acao, digite 'desfazer'. Para refazer a ultima acao desfeita, digite 'refazer'.\n") # Exibe mensagem de desfazer/refazer
+    print("Para gravar o estado apos executar o codigo, digite 'snapshot <nome_do_arquivo>'. Para retomar a partir dele, digite 'retomar <nome_do_arquivo>'.\n") # Exibe mensagem de snapshot
 
     code_lines = [] # Lista de linhas de codigo
     undo_stack = [] # Pilha de desfazer
     redo_stack = [] # Pilha de refazer
+    snapshot_state = None # Estado carregado pelo ultimo 'retomar'
+    snapshot_file = None # Arquivo do snapshot retomado
 
 
     def undo(): # Desfaz a ultima acao
@@ -644,6 +978,9 @@ def execute_user_code(): # Funcao principal
             try: # Tenta compilar o codigo
                 tokens = lexer(code) # Realiza a analise lexica
                 parser = Parser(tokens) # Cria um parser
+                if snapshot_state: # Verifica se ha um snapshot para retomar
+                    parser.variables.update(snapshot_state.variables) # Parte das variaveis gravadas
+                    parser.functions.update(snapshot_state.functions) # Parte das funcoes gravadas
                 parser.parse() # Realiza a analise sintatica e executa o codigo
             except (SyntaxError, NameError) as e: # Trata erros de sintaxe e nomes
                 erro_msg = str(e) # Pega a mensagem de erro
@@ -676,6 +1013,34 @@ def execute_user_code(): # Funcao principal
                     print(f"{i+1}: {code_line.strip()}") # Exibe a linha do codigo
             except FileNotFoundError: # Trata erro de arquivo nao encontrado
                 print(f"Arquivo {filename} nao encontrado.") # Exibe mensagem de arquivo nao encontrado
+        elif line.strip().lower().startswith('snapshot '): # Verifica se o usuario digitou 'snapshot'
+            filename = line.strip().split(' ', 1)[1] # Pega o nome do arquivo
+            try: # Tenta executar o codigo e gravar o estado
+                parser = Parser(lexer("\n".join(code_lines))) # Cria um parser
+                if snapshot_state: # Verifica se ha um snapshot para retomar
+                    parser.variables.update(snapshot_state.variables) # Parte das variaveis gravadas
+                    parser.functions.update(snapshot_state.functions) # Parte das funcoes gravadas
+                parser.parse() # Executa o codigo
+                if snapshot_state and os.path.exists(filename) and os.path.exists(snapshot_file) \
+                        and os.path.samefile(filename, snapshot_file): # Sobrescreve o snapshot retomado
+                    close_snapshot(snapshot_state) # Le as listas pendentes e fecha o mapeamento (o Windows nao substitui arquivos mapeados)
+                save_snapshot(filename, parser) # Grava o estado global
+                print(f"Snapshot {filename} salvo com sucesso.") # Exibe mensagem de snapshot salvo
+            except (SyntaxError, NameError, ValueError, OSError) as e: # Trata erros de execucao e gravacao
+                print(f"Erro: {e}") # Exibe a mensagem de erro
+        elif line.strip().lower().startswith('retomar '): # Verifica se o usuario digitou 'retomar'
+            filename = line.strip().split(' ', 1)[1] # Pega o nome do arquivo
+            try: # Tenta carregar o snapshot
+                state = load_snapshot(filename) # Carrega o snapshot uma unica vez
+                if snapshot_state: # Descarta o snapshot anterior
+                    close_snapshot(snapshot_state, load=False) # Fecha o mapeamento sem ler as listas
+                snapshot_state = state # Usa o snapshot nas proximas compilacoes
+                snapshot_file = filename # Guarda o arquivo retomado
+                print(f"Snapshot {filename} carregado com sucesso.") # Exibe mensagem de snapshot carregado
+            except FileNotFoundError: # Trata erro de arquivo nao encontrado
+                print(f"Arquivo {filename} nao encontrado.") # Exibe mensagem de arquivo nao encontrado
+            except (ValueError, OSError) as e: # Trata arquivo que nao e um snapshot ou nao pode ser lido
+                print(f"Erro: {e}") # Exibe a mensagem de erro
         elif line.strip().lower() == 'desfazer': # Verifica se o usuario digitou 'desfazer'
             undo() # Desfaz a ultima acao
         elif line.strip().lower() == 'refazer': # Verifica se o usuario digitou 'refazer'
@@ -692,4 +1057,5 @@ def execute_user_code(): # Funcao principal
             code_lines.append(line) # Adiciona a linha ao codigo
             undo_stack.clear() # Limpa a pilha de desfazer
 
-execute_user_code() # Executa o loop interativo do editor
+if __name__ == '__main__': # Permite importar o modulo para registrar funcoes nativas
+    execute_user_code() # Executa o loop interativo do editor